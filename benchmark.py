@@ -0,0 +1,349 @@
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from threading import Event, Thread
+
+import httpx
+import uvicorn
+import websockets
+
+import config
+import server
+from static_files import StaticIndex
+
+# Seconds a websocket client waits for the next frame before giving up
+RECEIVE_TIMEOUT = 10
+
+stub_stop = Event()
+
+
+def stub_bot(*args):
+    """Stand-in for tixcraft.main that keeps the bot thread alive without a browser."""
+    # Sleep in short steps so raise_SystemExit_in_thread can interrupt it
+    while not stub_stop.is_set():
+        time.sleep(0.05)
+
+
+def get_unused_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def summarize(samples: list[float]) -> dict:
+    """Summarize latency samples given in seconds as milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def prepare_sandbox(work_dir: str):
+    """Point config, log and static paths at a temporary copy of the app data."""
+    config_path = os.path.join(work_dir, "config.json")
+    shutil.copyfile(config.CONFIG_JSON_PATH, config_path)
+    config.CONFIG_JSON_PATH = config_path
+    config.load_config(force=True)
+
+    server.LOG_DIR = os.path.join(work_dir, "logs")
+    server.tixcraft_main = stub_bot
+
+    dist_dir = os.path.join(work_dir, "dist")
+    os.makedirs(os.path.join(dist_dir, "assets"))
+    with open(os.path.join(dist_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write("<!doctype html><html><body><div id='app'></div></body></html>")
+    script = "console.log('benchmark');\n" * 4096
+    script_path = os.path.join(dist_dir, "assets", "index-bench.js")
+    with open(script_path, "w", encoding="utf-8") as f:
+        f.write(script)
+    with gzip.open(f"{script_path}.gz", "wt", encoding="utf-8") as f:
+        f.write(script)
+    server.static_index = StaticIndex(dist_dir)
+
+
+def start_server(port: int) -> tuple[uvicorn.Server, Thread]:
+    uvicorn_config = uvicorn.Config(
+        server.app, host="127.0.0.1", port=port, lifespan="on", log_level="warning"
+    )
+    uvicorn_server = uvicorn.Server(uvicorn_config)
+    uvicorn_thread = Thread(target=uvicorn_server.run, daemon=True)
+    uvicorn_thread.start()
+    while not uvicorn_server.started:
+        time.sleep(0.01)
+    return uvicorn_server, uvicorn_thread
+
+
+def produce_log_records(count: int):
+    for i in range(count):
+        record = logging.LogRecord(
+            "benchmark", logging.INFO, __file__, 0, "benchmark record %d", (i,), None
+        )
+        server.log_queue.put(record)
+
+
+async def receive_log_records(
+    websocket, start_seq: int, expected: int, latencies: list[float]
+) -> tuple[int, float]:
+    received = 0
+    finished_at = time.perf_counter()
+    while received < expected:
+        try:
+            frame = await asyncio.wait_for(websocket.recv(), RECEIVE_TIMEOUT)
+        except asyncio.TimeoutError:
+            break
+        now = time.time()
+        finished_at = time.perf_counter()
+        for item in json.loads(frame):
+            if item["seq"] < start_seq:
+                continue
+            latencies.append(now - item["time"])
+            received += 1
+    return received, finished_at
+
+
+async def bench_log_fanout(ws_url: str, clients: int, records: int) -> dict:
+    websockets_list = [
+        await websockets.connect(f"{ws_url}/ws/logs?format=json", max_size=None)
+        for _ in range(clients)
+    ]
+    start_seq = server.log_history.next_seq
+    latencies = list()
+    started_at = time.perf_counter()
+    receivers = [
+        receive_log_records(websocket, start_seq, records, latencies)
+        for websocket in websockets_list
+    ]
+    _, *results = await asyncio.gather(
+        asyncio.to_thread(produce_log_records, records), *receivers
+    )
+    for websocket in websockets_list:
+        await websocket.close()
+
+    received = sum(count for count, _ in results)
+    elapsed = max(finished_at for _, finished_at in results) - started_at
+    return {
+        "clients": clients,
+        "records": records,
+        "delivered": received,
+        "dropped": clients * records - received,
+        "elapsed_s": elapsed,
+        "deliveries_per_s": received / elapsed if elapsed else 0.0,
+        "latency": summarize(latencies),
+    }
+
+
+async def wait_for_status(websocket, expected: str) -> float:
+    while True:
+        status = await asyncio.wait_for(websocket.recv(), RECEIVE_TIMEOUT)
+        if status == expected:
+            return time.perf_counter()
+
+
+async def bench_status_push(
+    client: httpx.AsyncClient, ws_url: str, clients: int, iterations: int
+) -> dict:
+    stub_stop.clear()
+    await client.put("/api/bot/tixcraft", json={"action": "run"})
+    websockets_list = [
+        await websockets.connect(f"{ws_url}/ws/thread/status") for _ in range(clients)
+    ]
+    await asyncio.gather(
+        *(wait_for_status(websocket, "running") for websocket in websockets_list)
+    )
+
+    latencies = list()
+    for _ in range(iterations):
+        for change, expected in (
+            (server.pause_flag.set, "paused"),
+            (server.pause_flag.clear, "running"),
+        ):
+            started_at = time.perf_counter()
+            change()
+            received_at = await asyncio.gather(
+                *(wait_for_status(websocket, expected) for websocket in websockets_list)
+            )
+            latencies.extend(t - started_at for t in received_at)
+
+    for websocket in websockets_list:
+        await websocket.close()
+    stub_stop.set()
+    await client.put("/api/bot/tixcraft", json={"action": "stop"})
+    return {
+        "clients": clients,
+        "transitions": iterations * 2,
+        "latency": summarize(latencies),
+    }
+
+
+async def time_requests(
+    client: httpx.AsyncClient, iterations: int, method: str, url: str, **kwargs
+) -> tuple[list[float], httpx.Response]:
+    latencies = list()
+    response = None
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        latencies.append(time.perf_counter() - started_at)
+    return latencies, response
+
+
+async def bench_config(client: httpx.AsyncClient, iterations: int) -> dict:
+    read_latencies, response = await time_requests(
+        client, iterations, "GET", "/api/config"
+    )
+    stored = response.json()
+    write_latencies = list()
+    for i in range(iterations):
+        started_at = time.perf_counter()
+        # Alternate the value so every PUT changes the config and is saved
+        await client.put("/api/config", json={"REQUEST_TICKETS": i % 4 + 1})
+        write_latencies.append(time.perf_counter() - started_at)
+    await client.put(
+        "/api/config", json={"REQUEST_TICKETS": stored["REQUEST_TICKETS"]}
+    )
+    return {
+        "read": summarize(read_latencies),
+        "write": summarize(write_latencies),
+    }
+
+
+async def bench_static(client: httpx.AsyncClient, iterations: int) -> dict:
+    results = dict()
+    for name, path in (("index", "/"), ("asset", "/assets/index-bench.js")):
+        full, response = await time_requests(
+            client, iterations, "GET", path, headers={"Accept-Encoding": "gzip"}
+        )
+        conditional, not_modified = await time_requests(
+            client,
+            iterations,
+            "GET",
+            path,
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": response.headers.get("etag", ""),
+            },
+        )
+        results[name] = {
+            # httpx decodes the body, so take the size sent over the wire
+            "bytes": int(response.headers.get("content-length", 0)),
+            "content_encoding": response.headers.get("content-encoding"),
+            "cache_control": response.headers.get("cache-control"),
+            "full": summarize(full),
+            "conditional_status": not_modified.status_code,
+            "conditional": summarize(conditional),
+        }
+    return results
+
+
+def compare(report: dict, baseline: dict, path: str = "") -> list[str]:
+    """List the change of every millisecond metric present in both reports."""
+    lines = list()
+    for key, value in report.items():
+        if key not in baseline:
+            continue
+        name = f"{path}.{key}" if path else key
+        if isinstance(value, dict) and isinstance(baseline[key], dict):
+            lines.extend(compare(value, baseline[key], name))
+        elif key.endswith("_ms") and baseline[key]:
+            change = (value - baseline[key]) / baseline[key] * 100
+            lines.append(
+                f"{name}: {baseline[key]:.3f} -> {value:.3f} ms ({change:+.1f}%)"
+            )
+    return lines
+
+
+async def run_benchmarks(port: int, args: argparse.Namespace) -> dict:
+    http_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=http_url) as client:
+        return {
+            "log_fanout": await bench_log_fanout(ws_url, args.clients, args.records),
+            "status_push": await bench_status_push(
+                client, ws_url, args.clients, args.status_iterations
+            ),
+            "config": await bench_config(client, args.iterations),
+            "static": await bench_static(client, args.iterations),
+        }
+
+
+def get_git_commit() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=config.PROJ_DIR,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the control plane in server.py with the bot stubbed out."
+    )
+    parser.add_argument("--clients", type=int, default=10, help="websocket clients")
+    parser.add_argument("--records", type=int, default=5000, help="log records")
+    parser.add_argument("--iterations", type=int, default=200, help="HTTP requests")
+    parser.add_argument(
+        "--status-iterations", type=int, default=50, help="pause/continue cycles"
+    )
+    parser.add_argument("--output", default="benchmark_report.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="ticket-bot-bench-")
+    try:
+        prepare_sandbox(work_dir)
+        port = get_unused_port()
+        uvicorn_server, uvicorn_thread = start_server(port)
+        try:
+            results = asyncio.run(run_benchmarks(port, args))
+        finally:
+            uvicorn_server.should_exit = True
+            uvicorn_thread.join()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": get_git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for line in compare(results, baseline["results"]):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ import time
 import traceback
 from datetime import datetime
 
-import ddddocr
 from selenium.common.exceptions import NoSuchWindowException
 
 # for embedding
@@ -18,6 +17,20 @@ from config import DATE_FORMAT
 from type import Notify, TicketSoldOutError
 from utils import countdown, init_list, wait_if_paused, get_webdriver
 
+ocr_model = None
+ocr_lock = threading.Lock()
+
+
+def get_ocr():
+    """Build the captcha OCR model once and share it across bot runs."""
+    global ocr_model
+    with ocr_lock:
+        if ocr_model is None:
+            import ddddocr
+
+            ocr_model = ddddocr.DdddOcr()
+    return ocr_model
+
 
 class Bot:
     def __init__(
@@ -62,7 +75,9 @@ class Bot:
         self.auto_login = auto_login
         self.auto_input_captcha = auto_input_captcha
         self.session_index_list = init_list(session_index_list)
-        self.ocr = ddddocr.DdddOcr()
+        if self.auto_input_captcha:
+            # Load the model while the browser starts, not when a captcha is up
+            threading.Thread(target=get_ocr, name="ocr-loader", daemon=True).start()
         self.notify = Notify()
         self.driver = get_webdriver(
             user_data_dir=chrome_user_data_dir,
@@ -72,6 +87,10 @@ class Bot:
         self.logger = logger
         self.session_url_list = list()
 
+    @property
+    def ocr(self):
+        return get_ocr()
+
     def __del__(self):
         self.cleanup()
 
@@ -161,10 +180,12 @@ class Bot:
                     if not self.notify.need_notify():
                         break
                     self._screen_shot_ticket_detail()
+                    # Channels are sent concurrently, but wait for all of them
+                    # before the bot reports it has ended
                     self.notify.send(
                         f"{self.notify_prefix} {self.success_message}",
                         self.ticket_detail_img_path,
-                    )
+                    ).result()
                     break
                 else:
                     self.logger.info("無可購票區域，重新嘗試...")
@@ -190,5 +211,6 @@ class Bot:
         self.end_flag.clear()
         self.pause_flag.clear()
         self.continue_event.clear()
+        self.notify.close()
         self.logger.info("關閉瀏覽器")
         self.driver.quit()
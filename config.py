@@ -1,5 +1,6 @@
 import json
 import os
+import tempfile
 from datetime import datetime, timedelta
 from typing import TypedDict
 
@@ -53,13 +54,43 @@ class Config(TypedDict):
 PROJ_DIR = get_project_dir()
 FRONTEND_PATH = os.path.join(PROJ_DIR, "frontend", "dist")
 CHROME_USER_DATA_PATH = os.path.join(PROJ_DIR, "chrome_user_data")
+LOG_DIR = os.path.join(PROJ_DIR, "logs")
 DATE_FORMAT = "%Y/%m/%d %H:%M:%S.%f"
 
-def load_config():
+def get_config_signature() -> tuple[int, int]:
+    """Get the (mtime_ns, size) of config.json, used to detect changes on disk."""
+    stat = os.stat(CONFIG_JSON_PATH)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_derived_config(values: dict) -> dict:
+    """Compute the fields derived from the given changed values.
+
+    Raises:
+        ValueError: If a value cannot be parsed.
+    """
+    derived = dict()
+    if "TARGET_TIME_STR" in values:
+        derived["TARGET_TIME"] = datetime.strptime(
+            values["TARGET_TIME_STR"], DATE_FORMAT
+        )
+        derived["READY_TIME"] = derived["TARGET_TIME"] - timedelta(minutes=1)
+    return derived
+
+
+def load_config(force: bool = False):
+    """Load config.json into CONFIG unless it is unchanged since the last load."""
+    global config_signature
+    signature = get_config_signature()
+    if not force and signature == config_signature:
+        return
     with open(CONFIG_JSON_PATH, "r", encoding="utf-8") as f:
         j = json.load(f)
-        for k, v in j.items():
-            CONFIG[k] = v
+    changed = {k: v for k, v in j.items() if k not in CONFIG or CONFIG[k] != v}
+    derived = get_derived_config(changed)
+    CONFIG.update(changed)
+    CONFIG.update(derived)
+    config_signature = signature
 
 
 def get_stored_config() -> dict:
@@ -70,21 +101,54 @@ def get_stored_config() -> dict:
 
 
 def save_config():
+    """Write the stored keys to config.json through a temp file and an atomic rename."""
+    global config_signature
     tmp_dict = get_stored_config()
-    with open(CONFIG_JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(tmp_dict, f, ensure_ascii=False, indent=4)
-
-
-CONFIG_JSON_PATH = os.path.join(PROJ_DIR, "config.json")
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=".config.", suffix=".tmp", dir=os.path.dirname(CONFIG_JSON_PATH)
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(tmp_dict, f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(CONFIG_JSON_PATH):
+            os.chmod(tmp_path, os.stat(CONFIG_JSON_PATH).st_mode)
+        os.replace(tmp_path, CONFIG_JSON_PATH)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    # CONFIG already matches what was written, no need to parse it again
+    config_signature = get_config_signature()
+
+
+def update_stored_config(values: dict):
+    """Update CONFIG with the given values, recompute derived fields and save.
+
+    Derived fields are computed before anything is applied, so invalid values
+    leave CONFIG and config.json untouched.
+
+    Raises:
+        ValueError: If a value cannot be parsed.
+    """
+    changed = {k: v for k, v in values.items() if CONFIG.get(k) != v}
+    derived = get_derived_config(changed)
+    CONFIG.update(changed)
+    CONFIG.update(derived)
+    if changed:
+        save_config()
+
+
+# TICKET_BOT_CONFIG points at another config file, e.g. a scratch copy for tests
+CONFIG_JSON_PATH = os.environ.get(
+    "TICKET_BOT_CONFIG", os.path.join(PROJ_DIR, "config.json")
+)
 CONFIG = Config()
+config_signature: tuple[int, int] | None = None
 load_config()
 
 
 CONFIG["SELENIUM_WAIT_TIMEOUT"] = 120
-CONFIG["TARGET_TIME"] = datetime.strptime(
-    CONFIG["TARGET_TIME_STR"], "%Y/%m/%d %H:%M:%S.%f"
-)
-CONFIG["READY_TIME"] = CONFIG["TARGET_TIME"] - timedelta(minutes=1)
 
 CONFIG["SCREENSHOT_DIR"] = os.path.join(PROJ_DIR, "screenshots")
 CONFIG["TICKET_DETAIL_IMG_PATH"] = os.path.join(
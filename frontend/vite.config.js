@@ -1,10 +1,37 @@
 import { defineConfig } from 'vite';
 import vue from '@vitejs/plugin-vue';
 import path from 'path'; // 引入 path 模組
+import fs from 'fs';
+import { brotliCompressSync, constants, gzipSync } from 'zlib';
+
+// 建置後為文字類資源產生 .gz 與 .br 預先壓縮檔，後端依 Accept-Encoding 直接提供
+export const precompress = ({ threshold = 1024 } = {}) => ({
+  name: 'precompress',
+  apply: 'build',
+  writeBundle(options, bundle) {
+    for (const fileName of Object.keys(bundle)) {
+      if (!/\.(html|js|css|svg|json|ttf)$/.test(fileName)) {
+        continue;
+      }
+      const filePath = path.resolve(options.dir, fileName);
+      const content = fs.readFileSync(filePath);
+      if (content.length < threshold) {
+        continue; // 太小的檔案壓縮效益不大
+      }
+      fs.writeFileSync(`${filePath}.gz`, gzipSync(content, { level: 9 }));
+      fs.writeFileSync(
+        `${filePath}.br`,
+        brotliCompressSync(content, {
+          params: { [constants.BROTLI_PARAM_QUALITY]: 11 },
+        })
+      );
+    }
+  },
+});
 
 // https://vitejs.dev/config/
 export default defineConfig({
-  plugins: [vue()],
+  plugins: [vue(), precompress()],
   resolve: {
     alias: {
       '@': path.resolve(__dirname, 'src'), // 設定 '@' 別名指向 'src' 目錄
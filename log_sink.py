@@ -0,0 +1,113 @@
+import gzip
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging.handlers import BaseRotatingHandler, QueueListener
+from queue import Queue
+
+LOG_FILE_NAME = "bot.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_ROTATE_INTERVAL = 24 * 60 * 60
+LOG_BACKUP_COUNT = 20
+
+
+class CompressingRotatingFileHandler(BaseRotatingHandler):
+    """Rotate when the file reaches max_bytes or every interval seconds.
+
+    Rotated segments are renamed with a timestamp and gzipped on a background
+    worker, so the thread writing records only pays for a rename. Only the
+    newest backup_count compressed segments are kept.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = LOG_MAX_BYTES,
+        interval: int = LOG_ROTATE_INTERVAL,
+        backup_count: int = LOG_BACKUP_COUNT,
+    ):
+        super().__init__(filename, "a", encoding="utf-8", delay=False)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.rollover_at = time.time() + interval
+        self.compressor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="log-compress"
+        )
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.rollover_at:
+            return True
+        if self.stream is None:
+            self.stream = self._open()
+        if self.max_bytes > 0:
+            msg = f"{self.format(record)}\n"
+            self.stream.seek(0, 2)  # non-posix-compliant Windows feature
+            if self.stream.tell() + len(msg.encode(self.encoding)) >= self.max_bytes:
+                return True
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            segment = f"{self.baseFilename}.{timestamp}"
+            os.rename(self.baseFilename, segment)
+            self.compressor.submit(self.compress, segment)
+        self.stream = self._open()
+        self.rollover_at = time.time() + self.interval
+
+    def compress(self, segment: str):
+        with open(segment, "rb") as src, gzip.open(f"{segment}.gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(segment)
+        log_dir = os.path.dirname(self.baseFilename)
+        # The first entry is the active log file
+        for name in list_log_files(log_dir)[self.backup_count + 1 :]:
+            os.remove(os.path.join(log_dir, name))
+
+    def close(self):
+        self.compressor.shutdown(wait=True)
+        super().close()
+
+
+def list_log_files(log_dir: str) -> list[str]:
+    """List the current log file and its compressed segments, newest first."""
+    if not os.path.isdir(log_dir):
+        return []
+    segments = sorted(
+        (
+            name
+            for name in os.listdir(log_dir)
+            if name.startswith(f"{LOG_FILE_NAME}.") and name.endswith(".gz")
+        ),
+        reverse=True,
+    )
+    if os.path.exists(os.path.join(log_dir, LOG_FILE_NAME)):
+        return [LOG_FILE_NAME] + segments
+    return segments
+
+
+def start_log_sink(log_dir: str, log_queue: Queue) -> QueueListener:
+    """Write records put on log_queue to rotated files from a listener thread.
+
+    Records arrive already formatted by the bot's QueueHandler, so the file
+    handler only writes the message.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    handler = CompressingRotatingFileHandler(os.path.join(log_dir, LOG_FILE_NAME))
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
+def stop_log_sink(listener: QueueListener):
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
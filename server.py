@@ -1,54 +1,291 @@
 import asyncio
+import json
 import logging
 import os
+import subprocess
+import sys
 import threading
+from collections import deque
 from contextlib import asynccontextmanager
-from queue import Queue
+from itertools import islice
+from queue import Empty, Queue
 from threading import Event, Thread
-from typing import Optional
-
-from fastapi import FastAPI, Query, Request, WebSocket, WebSocketDisconnect
+from typing import Literal, NamedTuple, Optional
+
+import httpx
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.websockets import WebSocketState
 
-import tixcraft
-from config import CONFIG, FRONTEND_PATH, get_stored_config, load_config, save_config
-from type import ActionRequest, BotStatus, ConfigSchema, ProgramStatusEnum, SessionInfo
+from config import (
+    CONFIG,
+    FRONTEND_PATH,
+    LOG_DIR,
+    PROJ_DIR,
+    get_stored_config,
+    load_config,
+    update_stored_config,
+)
+from type import (
+    ActionRequest,
+    BotStatus,
+    ConfigSchema,
+    ImportTime,
+    LogEntry,
+    LogLevel,
+    ObservableEvent,
+    ProgramStatusEnum,
+    SessionInfo,
+)
+from log_sink import list_log_files, start_log_sink, stop_log_sink
+from session_info import SessionInfoCache
+from static_files import StaticIndex
 from utils import raise_SystemExit_in_thread
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global event_loop, status_changed
+    # Bound to this lifespan's loop, the app may be started more than once
+    status_changed = asyncio.Event()
+    event_loop = asyncio.get_running_loop()
+    session_info_cache.open()
+    static_index.build()
+    log_sink = start_log_sink(LOG_DIR, file_log_queue)
     task_logs = asyncio.create_task(send_logs())
     task_status = asyncio.create_task(send_status())
     yield
     log_queue.put("END")
     logger.info(f"send_logs.cancel: {task_logs.cancel()}")
     logger.info(f"send_status.cancel: {task_status.cancel()}")
+    await session_info_cache.close()
     logger.info(f"thread: {thread}")
     if thread:
         raise_SystemExit_in_thread(thread)
+    stop_log_sink(log_sink)
 
 
 app = FastAPI(lifespan=lifespan)
 thread = None
+event_loop: Optional[asyncio.AbstractEventLoop] = None
 # threading event
 continue_event = Event()
-wait_login_flag = Event()
-wait_captcha_flag = Event()
-pause_flag = Event()
-end_flag = Event()
+wait_login_flag = ObservableEvent()
+wait_captcha_flag = ObservableEvent()
+pause_flag = ObservableEvent()
+end_flag = ObservableEvent()
+# set while run_tixcraft_bot is running the bot
+bot_running = Event()
+# set whenever the bot status may have changed, created in lifespan
+status_changed: Optional[asyncio.Event] = None
 log_queue = Queue()
+# consumed by the persistent log sink, see log_sink.py
+file_log_queue = Queue()
 logger = logging.getLogger("uvicorn")
+static_index = StaticIndex(FRONTEND_PATH)
+# opened in lifespan
+session_info_cache = SessionInfoCache()
+
+# Maximum number of records taken from log_queue per thread hop
+LOG_BATCH_SIZE = 200
+# Number of recent records kept for replay and /api/logs
+LOG_HISTORY_SIZE = 2000
+# Maximum number of pending records buffered for a single log client, large
+# enough to hold a full history replay
+LOG_CLIENT_BUFFER_SIZE = LOG_HISTORY_SIZE
+
+
+class LogItem(NamedTuple):
+    seq: int
+    level: int
+    created: float
+    message: str
+
+    def to_dict(self) -> dict:
+        return {
+            "seq": self.seq,
+            "level": logging.getLevelName(self.level),
+            "time": self.created,
+            "message": self.message,
+        }
+
+
+class LogClient:
+    """A /ws/logs connection with its own bounded send buffer.
+
+    Records are pushed without awaiting the socket; a per-client sender drains
+    the buffer and sends everything pending as one frame. When the client
+    falls behind, the oldest records are dropped so a slow or dead client can
+    neither block the others nor grow memory without bound.
+
+    In text mode a frame is the messages joined by newlines, in json mode it
+    is a JSON array of seq/level/time/message objects. Records below level
+    are never buffered.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        structured: bool = False,
+        level: int = logging.NOTSET,
+        maxlen: int = LOG_CLIENT_BUFFER_SIZE,
+    ):
+        self.websocket = websocket
+        self.structured = structured
+        self.level = level
+        self.buffer: deque[LogItem] = deque(maxlen=maxlen)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def push(self, items: list[LogItem]):
+        if self.level > logging.NOTSET:
+            items = [item for item in items if item.level >= self.level]
+        if not items:
+            return
+        overflow = len(self.buffer) + len(items) - self.buffer.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self.buffer.extend(items)
+        self.ready.set()
+
+    def format(self, items: list[LogItem]) -> str:
+        if self.structured:
+            return json.dumps(
+                [item.to_dict() for item in items],
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        return "\n".join(item.message for item in items)
+
+    async def run(self):
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            if self.dropped:
+                logger.warning(f"Log client too slow, dropped {self.dropped} records")
+                self.dropped = 0
+            if not self.buffer:
+                continue
+            frame = self.format(list(self.buffer))
+            self.buffer.clear()
+            try:
+                await self.websocket.send_text(frame)
+            except Exception as e:
+                logger.warning(f"Error sending log to websocket: {e}")
+                return
+
+
+class LogHistory:
+    """Fixed-capacity ring buffer of recent log records keyed by sequence number."""
+
+    def __init__(self, maxlen: int = LOG_HISTORY_SIZE):
+        self.entries: deque[LogItem] = deque(maxlen=maxlen)
+        self.next_seq = 1
+
+    def extend(self, records: list[logging.LogRecord]) -> list[LogItem]:
+        items = list()
+        for record in records:
+            item = LogItem(
+                self.next_seq, record.levelno, record.created, record.getMessage()
+            )
+            items.append(item)
+            self.next_seq += 1
+        self.entries.extend(items)
+        return items
+
+    def page(self, after: int = 0, limit: int = 100) -> list[LogItem]:
+        """Return up to limit entries with a sequence number greater than after."""
+        if not self.entries:
+            return []
+        first_seq = self.entries[0].seq
+        start = max(after + 1 - first_seq, 0)
+        return list(islice(self.entries, start, start + limit))
+
+
+log_history = LogHistory()
 
 # Store all connected WebSocket clients
-logs_websockets: list[WebSocket] = []
+logs_websockets: list[LogClient] = []
 thread_status_websockets: list[WebSocket] = []
 
 
+def notify_status_change():
+    """Wake up send_status. Safe to call from any thread."""
+    if event_loop and not event_loop.is_closed():
+        event_loop.call_soon_threadsafe(status_changed.set)
+
+
+for flag in (wait_login_flag, wait_captcha_flag, pause_flag, end_flag):
+    flag.add_listener(notify_status_change)
+
+
+# tixcraft pulls in selenium, ddddocr and the notify backends, so it is only
+# imported on the bot thread once the bot runs
+def tixcraft_main(*args):
+    import tixcraft
+
+    tixcraft.main(*args)
+
+
+def run_tixcraft_bot(*args):
+    """Bot thread target, notifies status changes when the bot starts and ends."""
+    bot_running.set()
+    notify_status_change()
+    try:
+        tixcraft_main(*args)
+    finally:
+        # The thread is still alive here, so the status is taken from bot_running
+        bot_running.clear()
+        notify_status_change()
+
+
+def measure_import_time(module: str = "server") -> list[ImportTime]:
+    """Import module in a fresh interpreter with -X importtime and parse the report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJ_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        # The report stops at the failed import, show why instead of a partial list
+        errors = [
+            line
+            for line in result.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        raise HTTPException(
+            status_code=500,
+            detail=f"import {module} failed: " + "\n".join(errors[-20:]),
+        )
+    import_times = list()
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue
+        import_times.append(
+            ImportTime(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+    return import_times
+
+
 async def get_thread_status() -> ProgramStatusEnum:
     global thread
-    if thread and thread.is_alive():
+    if thread and thread.is_alive() and bot_running.is_set():
         if wait_login_flag.is_set():
             return ProgramStatusEnum.WATTING_LOGIN
         if wait_captcha_flag.is_set():
@@ -62,38 +299,67 @@ async def get_thread_status() -> ProgramStatusEnum:
         return ProgramStatusEnum.STOPPED
 
 
+def drain_log_queue(max_items: int = LOG_BATCH_SIZE) -> list:
+    """Block for the next record, then take whatever else is already queued."""
+    records = [log_queue.get()]
+    while len(records) < max_items:
+        try:
+            records.append(log_queue.get_nowait())
+        except Empty:
+            break
+    return records
+
+
 async def send_logs():
     while True:
-        logs: logging.LogRecord = await asyncio.to_thread(
-            log_queue.get
-        )  # Get log messages from the queue
-        if logs == "END":
+        # One thread hop per batch instead of per record
+        records: list = await asyncio.to_thread(drain_log_queue)
+        end = "END" in records
+        if end:
+            records = records[: records.index("END")]
+        if records:
+            items = log_history.extend(records)
+            # Hand the batch to every client buffer without awaiting any socket
+            for client in logs_websockets:
+                client.push(items)
+        if end:
             return
-        logs: str = logs.getMessage()
-        logger.debug("log from queue:", logs)
-        # Send logs to all connected WebSocket clients
-        for websocket in logs_websockets:
-            try:
-                await websocket.send_text(logs)
-            except Exception as e:
-                logger.warning(f"Error sending log to websocket: {e}")
 
 
 async def send_status():
+    last_status = await get_thread_status()
     while True:
+        await status_changed.wait()
+        status_changed.clear()
         status = await get_thread_status()
+        # Only push transitions
+        if status == last_status:
+            continue
+        last_status = status
         for websocket in thread_status_websockets:
             try:
                 await websocket.send_text(status.value)
             except Exception as e:
                 logger.warning(f"Error sending status to websocket: {e}")
-        await asyncio.sleep(0.5)
 
 
 @app.websocket("/ws/logs")
-async def websocket_logs(websocket: WebSocket):
+async def websocket_logs(
+    websocket: WebSocket,
+    format: Literal["text", "json"] = Query("text"),
+    level: Optional[LogLevel] = Query(None),
+    after: int = Query(0, ge=0),
+):
     await websocket.accept()
-    logs_websockets.append(websocket)  # Add to the connected list
+    client = LogClient(
+        websocket,
+        structured=format == "json",
+        level=logging.getLevelName(level) if level else logging.NOTSET,
+    )
+    # Replay the history after the client's last seen seq, live records follow
+    client.push(log_history.page(after, LOG_HISTORY_SIZE))
+    logs_websockets.append(client)  # Add to the connected list
+    sender = asyncio.create_task(client.run())
     try:
         while True:
             # Wait for the client to send any message to keep the connection alive
@@ -101,7 +367,8 @@ async def websocket_logs(websocket: WebSocket):
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
     finally:
-        logs_websockets.remove(websocket)  # Remove from the connected list
+        logs_websockets.remove(client)  # Remove from the connected list
+        sender.cancel()
         if not WebSocketState.DISCONNECTED:
             await websocket.close()  # Attempt to close the WebSocket
 
@@ -109,8 +376,10 @@ async def websocket_logs(websocket: WebSocket):
 @app.websocket("/ws/thread/status")
 async def websocket_thread_status(websocket: WebSocket):
     await websocket.accept()
+    # Register before sending the current state so no transition is missed
     thread_status_websockets.append(websocket)
     try:
+        await websocket.send_text((await get_thread_status()).value)
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
@@ -121,6 +390,26 @@ async def websocket_thread_status(websocket: WebSocket):
             await websocket.close()
 
 
+@app.get("/api/logs", response_model=list[LogEntry])
+async def get_logs(after: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    return [
+        LogEntry(**item.to_dict()) for item in log_history.page(after, limit)
+    ]
+
+
+@app.get("/api/logs/files", response_model=list[str])
+async def get_log_files():
+    return list_log_files(LOG_DIR)
+
+
+@app.get("/api/logs/files/{name}")
+async def download_log_file(name: str):
+    # Only serve names from the listing, never arbitrary paths
+    if name not in list_log_files(LOG_DIR):
+        return HTMLResponse(content="404 Not Found", status_code=404)
+    return FileResponse(os.path.join(LOG_DIR, name), filename=name)
+
+
 @app.put("/api/bot/tixcraft", response_model=BotStatus)
 async def control_tixcraft_bot(action_request: ActionRequest):
     global thread, continue_event, pause_flag, end_flag, log_queue
@@ -133,7 +422,7 @@ async def control_tixcraft_bot(action_request: ActionRequest):
     if action_request.action == "run":
         if not thread or not thread.is_alive():
             thread = Thread(
-                target=tixcraft.main,
+                target=run_tixcraft_bot,
                 args=(
                     continue_event,
                     wait_login_flag,
@@ -141,6 +430,7 @@ async def control_tixcraft_bot(action_request: ActionRequest):
                     pause_flag,
                     end_flag,
                     log_queue,
+                    file_log_queue,
                 ),
                 daemon=True,
             )
@@ -188,28 +478,44 @@ async def get_config():
 
 @app.put("/api/config", response_model=ConfigSchema)
 async def update_config(config: ConfigSchema):
-    for key, value in config:
-        if value is not None:
-            CONFIG[key] = value
-    save_config()
+    try:
+        update_stored_config(
+            {key: value for key, value in config if value is not None}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     return ConfigSchema(**get_stored_config())
 
 
 @app.get("/api/event/tixcraft", response_model=list[SessionInfo])
 async def get_tixcraft_event_info(event_url: Optional[str] = Query(None)):
     url = event_url if event_url else CONFIG["TIXCRAFT_EVENT_URL"]
-    info = tixcraft.Tixcraft.get_session_info(url)
-    for i, session in enumerate(info):
-        session["id"] = i
-    return info
+    try:
+        info = await session_info_cache.get(url)
+    # The URL itself is bad, InvalidURL is not even an HTTPError
+    except (httpx.InvalidURL, httpx.UnsupportedProtocol) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid event URL {url}: {e}")
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to fetch {url}: {e}")
+    return [dict(session, id=i) for i, session in enumerate(info)]
+
+
+@app.get("/api/debug/importtime", response_model=list[ImportTime])
+async def get_import_time(limit: int = Query(30, ge=1)):
+    # Packaged builds have no interpreter to run -X importtime with
+    if getattr(sys, "frozen", False) or "__compiled__" in globals():
+        return []
+    import_times = await asyncio.to_thread(measure_import_time)
+    import_times.sort(key=lambda item: item.cumulative_us, reverse=True)
+    return import_times[:limit]
 
 
 @app.get("/{full_path:path}")
 async def catch_all(request: Request, full_path: str):
     if not full_path:
         full_path = "index.html"
-    file_path = os.path.join(FRONTEND_PATH, full_path)
-    if os.path.exists(file_path):
-        return FileResponse(file_path)
+    entry = static_index.get(full_path)
+    if entry:
+        return static_index.response(request, entry)
     else:
         return HTMLResponse(content="404 Not Found", status_code=404)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import httpx
+
+# Seconds a fetched session list is served from cache
+SESSION_INFO_TTL = 10
+SESSION_INFO_TIMEOUT = 10
+
+
+def parse_session_info(html: str) -> list:
+    """Parse the session table of a tixcraft event page."""
+    # bs4 is only needed once a lookup happens, keep it out of server startup
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    rows = soup.select("#gameList > table > tbody > tr")
+    events = list()
+    for row in rows:
+        if "目前無場次資訊" in row.text.strip():
+            return events
+        cells = row.find_all("td")
+        # Skip banner or placeholder rows that are not a full session entry
+        if len(cells) < 4:
+            continue
+        event = {
+            "performance_time": cells[0].get_text(strip=True),
+            "event_name": cells[1].get_text(strip=True),
+            "venue": cells[2].get_text(strip=True),
+            "purchase_status": cells[3].get_text(strip=True),
+        }
+        events.append(event)
+    return events
+
+
+class SessionInfoCache:
+    """Fetch event session info on a pooled client with a short per-URL cache.
+
+    Concurrent lookups of the same URL share one fetch. Failed fetches raise
+    to every waiting caller and are not cached.
+    """
+
+    def __init__(self, ttl: float = SESSION_INFO_TTL):
+        self.ttl = ttl
+        self.client: httpx.AsyncClient | None = None
+        self.cache: dict[str, tuple[float, list]] = dict()
+        self.pending: dict[str, asyncio.Task] = dict()
+
+    def open(self):
+        self.client = httpx.AsyncClient(
+            timeout=SESSION_INFO_TIMEOUT, follow_redirects=True
+        )
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    async def get(self, url: str) -> list:
+        """Get session info from cache, or fetch it once for all concurrent callers.
+
+        Raises:
+            httpx.HTTPError: If the page cannot be fetched.
+        """
+        cached = self.cache.get(url)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        task = self.pending.get(url)
+        if task is None:
+            task = asyncio.create_task(self.__load(url))
+            self.pending[url] = task
+        # A cancelled caller must not cancel the fetch other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def __load(self, url: str) -> list:
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            # BeautifulSoup parsing is CPU bound, keep it off the event loop
+            info = await asyncio.to_thread(parse_session_info, response.text)
+            now = time.monotonic()
+            for key, (fetched_at, _) in list(self.cache.items()):
+                if now - fetched_at >= self.ttl:
+                    del self.cache[key]
+            self.cache[url] = (now, info)
+            return info
+        finally:
+            self.pending.pop(url, None)
@@ -0,0 +1,138 @@
+import mimetypes
+import os
+from typing import NamedTuple
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+# Vite puts content-hashed bundles under assets/, so they never change in place
+IMMUTABLE_DIR = "assets"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# Precompressed variants looked up next to each file, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+class StaticFile(NamedTuple):
+    path: str
+    stat: os.stat_result
+    etag: str
+    media_type: str
+    cache_control: str
+
+
+class StaticEntry(NamedTuple):
+    file: StaticFile
+    variants: dict[str, StaticFile]
+
+
+def make_etag(stat: os.stat_result, suffix: str = "") -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"'
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q value."""
+    qualities = dict()
+    for part in header.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    # A malformed q value cannot be trusted, treat the coding as rejected
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def accepts_encoding(qualities: dict[str, float], encoding: str) -> bool:
+    """Check a coding against parsed Accept-Encoding, falling back to "*"."""
+    return qualities.get(encoding, qualities.get("*", 0.0)) > 0
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class StaticIndex:
+    """In-memory index of the built frontend, so requests never touch the disk to look up files."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.entries: dict[str, StaticEntry] = dict()
+
+    def build(self):
+        entries = dict()
+        for dir_path, _, file_names in os.walk(self.root):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                rel_path = os.path.relpath(path, self.root).replace(os.sep, "/")
+                # Precompressed variants are served through their original file
+                if any(
+                    path.endswith(ext) and os.path.isfile(path.removesuffix(ext))
+                    for ext in ENCODINGS.values()
+                ):
+                    continue
+                entries[rel_path] = self.__make_entry(rel_path, path)
+        self.entries = entries
+
+    def __make_entry(self, rel_path: str, path: str) -> StaticEntry:
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if rel_path.startswith(f"{IMMUTABLE_DIR}/"):
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = REVALIDATE_CACHE_CONTROL
+        stat = os.stat(path)
+        file = StaticFile(path, stat, make_etag(stat), media_type, cache_control)
+        variants = dict()
+        for encoding, ext in ENCODINGS.items():
+            if os.path.isfile(path + ext):
+                variant_stat = os.stat(path + ext)
+                variants[encoding] = StaticFile(
+                    path + ext,
+                    variant_stat,
+                    make_etag(variant_stat, f"-{encoding}"),
+                    media_type,
+                    cache_control,
+                )
+        return StaticEntry(file, variants)
+
+    def get(self, rel_path: str) -> StaticEntry | None:
+        return self.entries.get(rel_path)
+
+    def response(self, request: Request, entry: StaticEntry) -> Response:
+        """Serve the best variant of a file, or 304 if the client copy is current."""
+        file = entry.file
+        headers = {"Cache-Control": file.cache_control}
+        if entry.variants:
+            headers["Vary"] = "Accept-Encoding"
+            qualities = parse_accept_encoding(
+                request.headers.get("accept-encoding", "")
+            )
+            for encoding, variant in entry.variants.items():
+                if accepts_encoding(qualities, encoding):
+                    file = variant
+                    headers["Content-Encoding"] = encoding
+                    break
+        headers["ETag"] = file.etag
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, file.etag):
+            headers.pop("Content-Encoding", None)
+            return Response(status_code=304, headers=headers)
+        return FileResponse(
+            file.path,
+            headers=headers,
+            media_type=file.media_type,
+            stat_result=file.stat,
+        )
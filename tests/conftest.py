@@ -0,0 +1,92 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+PROJ_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJ_DIR)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+config_dir = None
+
+
+def pytest_configure(config):
+    """config.py loads and saves config.json, point it at a scratch copy of the packaged one."""
+    global config_dir
+    config_dir = tempfile.mkdtemp(prefix="ticket-bot-test-")
+    config_path = os.path.join(config_dir, "config.json")
+    shutil.copyfile(os.path.join(PROJ_DIR, "package", "config.json"), config_path)
+    os.environ["TICKET_BOT_CONFIG"] = config_path
+
+
+def pytest_unconfigure(config):
+    if config_dir:
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local stand-in for a remote HTTP API that records every request."""
+
+    def __init__(self, routes: dict):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        # path -> (status, body, delay in seconds)
+        self.routes = routes
+        self.requests = list()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def hits(self, path: str) -> int:
+        with self.lock:
+            return sum(1 for _, p, _, _ in self.requests if p == path)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def __handle(self, method: str):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        with self.server.lock:
+            self.server.requests.append((method, self.path, dict(self.headers), body))
+        status, response, delay = self.server.routes.get(self.path, (404, b"", 0))
+        if delay:
+            threading.Event().wait(delay)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def do_GET(self):
+        self.__handle("GET")
+
+    def do_POST(self):
+        self.__handle("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    servers = list()
+
+    def start(routes: dict) -> StubServer:
+        server = StubServer(routes)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
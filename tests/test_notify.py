@@ -0,0 +1,54 @@
+import pytest
+
+from config import CONFIG
+from type import Notify, NotifyResult
+
+LINE_PATH = "/api/notify"
+IMAGE = b"\x89PNG\r\n\x1a\nticket detail"
+
+
+@pytest.fixture
+def line_only(monkeypatch):
+    monkeypatch.setitem(CONFIG, "TG_TOKEN", None)
+    monkeypatch.setitem(CONFIG, "TG_CHAT_ID", None)
+    monkeypatch.setitem(CONFIG, "LINE_NOTIFY_TOKEN", "line-token")
+
+
+def send(server, message: str, image_path: str = None) -> list[NotifyResult]:
+    notify = Notify()
+    notify.LINE_NOTIFY_URL = server.url + LINE_PATH
+    try:
+        return notify.send(message, image_path).result(timeout=10)
+    finally:
+        notify.close()
+
+
+def test_line_notify_sends_message_and_image(stub_server, line_only, tmp_path):
+    server = stub_server({LINE_PATH: (200, b'{"status":200}', 0)})
+    image_path = tmp_path / "ticket_detail.png"
+    image_path.write_bytes(IMAGE)
+
+    results = send(server, "Test 已成功購票", str(image_path))
+
+    assert len(results) == 1
+    assert results[0].channel == "line_notify"
+    assert results[0].success
+    assert results[0].latency > 0
+    method, path, headers, body = server.requests[0]
+    assert (method, path) == ("POST", LINE_PATH)
+    assert headers["Authorization"] == "Bearer line-token"
+    assert "Test 已成功購票".encode() in body
+    assert b'filename="ticket_detail.png"' in body
+    assert IMAGE in body
+
+
+def test_line_notify_reports_failure(stub_server, line_only):
+    server = stub_server({LINE_PATH: (401, b'{"status":401}', 0)})
+
+    results = send(server, "Test")
+
+    assert len(results) == 1
+    assert results[0].channel == "line_notify"
+    assert not results[0].success
+    assert "401" in results[0].detail
+    assert server.hits(LINE_PATH) == 1
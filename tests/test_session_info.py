@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+
+from conftest import read_fixture
+from session_info import SessionInfoCache, parse_session_info
+
+EVENT_PATH = "/activity/game/24_realive"
+EXPECTED = [
+    {
+        "performance_time": "2024/11/16 (六) 19:00",
+        "event_name": "2024 RE:LIVE 台北場",
+        "venue": "台北小巨蛋",
+        "purchase_status": "Find tickets",
+    },
+    {
+        "performance_time": "2024/11/17 (日) 18:00",
+        "event_name": "2024 RE:LIVE 台北場",
+        "venue": "台北小巨蛋",
+        "purchase_status": "選購一空",
+    },
+]
+
+
+async def lookup(cache: SessionInfoCache, *urls: str) -> list:
+    """Look up all urls concurrently on a freshly opened client."""
+    cache.open()
+    try:
+        return await asyncio.gather(*(cache.get(url) for url in urls))
+    finally:
+        await cache.close()
+
+
+def test_parses_and_caches_event_page(stub_server):
+    server = stub_server({EVENT_PATH: (200, read_fixture("tixcraft_event.html"), 0)})
+    cache = SessionInfoCache()
+    # The cache outlives the client, so the second lookup is served from it
+    assert asyncio.run(lookup(cache, server.url + EVENT_PATH)) == [EXPECTED]
+    assert asyncio.run(lookup(cache, server.url + EVENT_PATH)) == [EXPECTED]
+    assert server.hits(EVENT_PATH) == 1
+
+
+def test_merges_concurrent_requests(stub_server):
+    server = stub_server(
+        {EVENT_PATH: (200, read_fixture("tixcraft_event.html"), 0.2)}
+    )
+    results = asyncio.run(lookup(SessionInfoCache(), *[server.url + EVENT_PATH] * 5))
+    assert all(result == EXPECTED for result in results)
+    assert server.hits(EVENT_PATH) == 1
+
+
+def test_refetches_after_ttl(stub_server):
+    server = stub_server({EVENT_PATH: (200, read_fixture("tixcraft_event.html"), 0)})
+    cache = SessionInfoCache(ttl=0)
+    for _ in range(2):
+        asyncio.run(lookup(cache, server.url + EVENT_PATH))
+    assert server.hits(EVENT_PATH) == 2
+
+
+def test_does_not_cache_errors(stub_server):
+    server = stub_server({EVENT_PATH: (503, b"blocked", 0)})
+    cache = SessionInfoCache()
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(lookup(cache, server.url + EVENT_PATH))
+    assert server.hits(EVENT_PATH) == 2
+    assert not cache.cache
+
+
+def test_skips_incomplete_rows():
+    html = read_fixture("tixcraft_event.html").decode()
+    html = html.replace("<tbody>", '<tbody>\n<tr><td colspan="4">加場公告</td></tr>')
+    assert parse_session_info(html) == EXPECTED
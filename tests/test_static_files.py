@@ -0,0 +1,100 @@
+import gzip
+
+import pytest
+from fastapi import Request
+
+from static_files import (
+    IMMUTABLE_CACHE_CONTROL,
+    StaticIndex,
+    accepts_encoding,
+    parse_accept_encoding,
+)
+
+SCRIPT = b"console.log('static');\n" * 256
+
+
+@pytest.fixture
+def static_index(tmp_path):
+    assets_dir = tmp_path / "assets"
+    assets_dir.mkdir()
+    (tmp_path / "index.html").write_bytes(b"<!doctype html><div id='app'></div>")
+    (assets_dir / "index.js").write_bytes(SCRIPT)
+    (assets_dir / "index.js.gz").write_bytes(gzip.compress(SCRIPT))
+    index = StaticIndex(str(tmp_path))
+    index.build()
+    return index
+
+
+def make_request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def test_variants_are_not_indexed_on_their_own(static_index):
+    assert set(static_index.entries) == {"index.html", "assets/index.js"}
+    assert set(static_index.get("assets/index.js").variants) == {"gzip"}
+
+
+def test_serves_gzip_variant_with_its_own_etag(static_index):
+    entry = static_index.get("assets/index.js")
+    plain = static_index.response(make_request(), entry)
+    gzipped = static_index.response(make_request(accept_encoding="gzip, br"), entry)
+
+    assert plain.path == entry.file.path
+    assert "content-encoding" not in plain.headers
+    assert gzipped.path == entry.variants["gzip"].path
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+    for response in (plain, gzipped):
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_rejected_encoding_falls_back_to_identity(static_index):
+    entry = static_index.get("assets/index.js")
+    for header in ("gzip;q=0", "gzip; q=0.000, identity", "*;q=0"):
+        response = static_index.response(make_request(accept_encoding=header), entry)
+        assert response.path == entry.file.path
+        assert "content-encoding" not in response.headers
+
+
+def test_wildcard_accepts_variant(static_index):
+    entry = static_index.get("assets/index.js")
+    response = static_index.response(make_request(accept_encoding="*"), entry)
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_matching_etag_returns_not_modified(static_index):
+    entry = static_index.get("assets/index.js")
+    first = static_index.response(make_request(accept_encoding="gzip"), entry)
+    response = static_index.response(
+        make_request(accept_encoding="gzip", if_none_match=first.headers["etag"]),
+        entry,
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == first.headers["etag"]
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    # The gzip ETag must not validate the identity copy
+    response = static_index.response(
+        make_request(if_none_match=first.headers["etag"]), entry
+    )
+    assert response.status_code == 200
+
+
+def test_parse_accept_encoding():
+    qualities = parse_accept_encoding("GZIP;q=0.5, br;q=0.00, *;q=0.1, x;q=bad")
+    assert qualities == {"gzip": 0.5, "br": 0.0, "*": 0.1, "x": 0.0}
+    assert accepts_encoding(qualities, "gzip")
+    assert not accepts_encoding(qualities, "br")
+    assert accepts_encoding(qualities, "deflate")
+    assert not accepts_encoding(parse_accept_encoding(""), "gzip")
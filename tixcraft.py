@@ -24,6 +24,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import CHROME_USER_DATA_PATH, CONFIG
 from bot import Bot
+from session_info import parse_session_info
 from type import DummyEvent, TicketSoldOutError
 from utils import selenium_get_img
 
@@ -224,21 +225,7 @@ class Tixcraft(Bot):
 
     def get_session_info(event_url):
         response = requests.get(event_url)
-        soup = BeautifulSoup(response.text, "html.parser")
-        rows = soup.select("#gameList > table > tbody > tr")
-        events = list()
-        for row in rows:
-            if "目前無場次資訊" in row.text.strip():
-                return events
-            cells = row.find_all("td")
-            event = {
-                "performance_time": cells[0].get_text(strip=True),
-                "event_name": cells[1].get_text(strip=True),
-                "venue": cells[2].get_text(strip=True),
-                "purchase_status": cells[3].get_text(strip=True),
-            }
-            events.append(event)
-        return events
+        return parse_session_info(response.text)
 
     def refresh_session_links(self):
         self.logger.info("更新場次購票連結")
@@ -308,20 +295,24 @@ class Tixcraft(Bot):
         return available_url_list
 
 
-def __get_logger(log_queue):
+def __get_logger(log_queue, file_log_queue=None):
     if log_queue:
-        log_handler = QueueHandler(log_queue)
+        log_handlers = [QueueHandler(log_queue)]
     else:
-        log_handler = logging.StreamHandler(sys.stdout)
+        log_handlers = [logging.StreamHandler(sys.stdout)]
+    if file_log_queue:
+        # Written to disk by the listener in log_sink, not on this thread
+        log_handlers.append(QueueHandler(file_log_queue))
 
     formatter = logging.Formatter("%(asctime)s - :%(levelname)s - %(message)s")
-    log_handler.setFormatter(formatter)
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
         handler.close()
-    logger.addHandler(log_handler)
+    for log_handler in log_handlers:
+        log_handler.setFormatter(formatter)
+        logger.addHandler(log_handler)
     return logger
 
 
@@ -332,6 +323,7 @@ def main(
     pause_flag: threading.Event = None,
     end_flag: threading.Event = None,
     log_queue=None,
+    file_log_queue=None,
 ):
     if not continue_event:
         continue_event = DummyEvent()
@@ -344,7 +336,7 @@ def main(
     if not wait_captcha_flag:
         wait_captcha_flag = DummyEvent()
 
-    logger = __get_logger(log_queue)
+    logger = __get_logger(log_queue, file_log_queue)
     try:
         logger.info("開啟瀏覽器")
         ticket_bot = Tixcraft(
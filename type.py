@@ -1,13 +1,13 @@
 import asyncio
 import os
-from enum import Enum
 import threading
+import time
+from concurrent.futures import Future
+from enum import Enum
 from typing import Literal, Optional
 
-import requests
+import httpx
 from pydantic import BaseModel
-from telegram import Bot, InputFile
-from telegram.error import TelegramError
 
 from config import CONFIG
 
@@ -16,58 +16,159 @@ class TicketSoldOutError(Exception):
     pass
 
 
+class NotifyResult(BaseModel):
+    channel: str
+    success: bool
+    latency: float
+    detail: str = ""
+
+
 class Notify:
+    """Send notifications to every configured channel concurrently.
+
+    Sending happens on a background thread that owns one event loop and the
+    pooled HTTP clients, so the bot thread only hands off the message.
+    """
+
+    LINE_NOTIFY_URL = "https://notify-api.line.me/api/notify"
+    TIMEOUT = 30
+
     def __init__(self):
         self.send_method = []
+        self.bot = None
         if CONFIG["TG_TOKEN"] and CONFIG["TG_CHAT_ID"]:
+            from telegram import Bot
+
             self.send_method.append(self.telegram_bot_send)
             self.bot = Bot(token=CONFIG["TG_TOKEN"])
 
         if CONFIG["LINE_NOTIFY_TOKEN"]:
             self.send_method.append(self.line_notify_send)
-            
+
+        self.loop = None
+        self.worker = None
+        self.client = None
+        self.pending = set()
+
     def need_notify(self) -> bool:
         return bool(self.send_method)
 
-    def send(self, message: str, image_path: str = None):
-        if not os.path.exists(image_path):
+    def send(self, message: str, image_path: str = None) -> Future:
+        """Dispatch message to all channels in the background.
+
+        Returns:
+            Future: Resolves to a list of NotifyResult, one per channel.
+        """
+        image = None
+        if image_path and os.path.exists(image_path):
+            # Read once, every channel shares the same bytes
+            with open(image_path, "rb") as image_file:
+                image = image_file.read()
+        elif image_path:
             print(f"Image path: {image_path} not exists.")
-            image_path = None
-        for method in self.send_method:
-            method(message, image_path)
-        return
+        self.__start_worker()
+        return asyncio.run_coroutine_threadsafe(
+            self.__dispatch(message, image, os.path.basename(image_path or "")),
+            self.loop,
+        )
+
+    def close(self):
+        """Wait for pending notifications, then close clients and stop the worker."""
+        if not self.worker:
+            return
+        asyncio.run_coroutine_threadsafe(self.__close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.worker.join()
+        self.loop.close()
+        self.worker = None
+        self.loop = None
 
-    def telegram_bot_send(self, message: str, image_path: str = None):
-        asyncio.run(self.__telegram_bot_send(message, image_path))
+    def __start_worker(self):
+        if self.worker:
+            return
+        self.loop = asyncio.new_event_loop()
+        self.worker = threading.Thread(
+            target=self.loop.run_forever, name="notify", daemon=True
+        )
+        self.worker.start()
 
-    async def __telegram_bot_send(self, message: str, image_path: str = None):
+    async def __close(self):
+        await asyncio.gather(*self.pending, return_exceptions=True)
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+        if self.bot:
+            await self.bot.shutdown()
+
+    async def __dispatch(
+        self, message: str, image: bytes | None, image_name: str
+    ) -> list[NotifyResult]:
+        task = asyncio.current_task()
+        self.pending.add(task)
         try:
-            if image_path:
-                with open(image_path, "rb") as image_file:
-                    await self.bot.send_photo(
-                        chat_id=CONFIG["TG_CHAT_ID"],
-                        caption=message,
-                        photo=InputFile(image_file),
-                    )
-            else:
-                await self.bot.send_message(chat_id=CONFIG["TG_CHAT_ID"], text=message)
-            print("Message sent successfully!")
-        except TelegramError as e:
-            print(f"Failed to send message: {e}")
-
-    def line_notify_send(self, message: str, image_path: str = None):
-        url = "https://notify-api.line.me/api/notify"
-        headers = {"Authorization": f"Bearer {CONFIG["LINE_NOTIFY_TOKEN"]}"}
-        data = {"message": message}
-        files = {"imageFile": open(image_path, "rb")} if image_path else None
-        print(f"Sending message: {message}")
-        print(f"Sending files: {files}")
-        response = requests.post(url, headers=headers, data=data, files=files)
-        if response.status_code == 200:
-            print("Message sent successfully!")
+            results = await asyncio.gather(
+                *(
+                    self.__timed(method, message, image, image_name)
+                    for method in self.send_method
+                )
+            )
+        finally:
+            self.pending.discard(task)
+        for result in results:
+            status = "sent" if result.success else "failed"
+            print(
+                f"[{result.channel}] {status} in {result.latency:.3f}s {result.detail}"
+            )
+        return results
+
+    async def __timed(
+        self, method, message: str, image: bytes | None, image_name: str
+    ) -> NotifyResult:
+        channel = method.__name__.removesuffix("_send")
+        start_time = time.perf_counter()
+        try:
+            detail = await method(message, image, image_name)
+            success = True
+        except Exception as e:
+            detail = f"{type(e).__name__}: {e}"
+            success = False
+        return NotifyResult(
+            channel=channel,
+            success=success,
+            latency=time.perf_counter() - start_time,
+            detail=detail,
+        )
+
+    async def telegram_bot_send(
+        self, message: str, image: bytes = None, image_name: str = ""
+    ) -> str:
+        from telegram import InputFile
+
+        # The bot keeps its connection pool on the worker loop across calls
+        await self.bot.initialize()
+        if image:
+            await self.bot.send_photo(
+                chat_id=CONFIG["TG_CHAT_ID"],
+                caption=message,
+                photo=InputFile(image, filename=image_name),
+            )
         else:
-            print(f"Failed to send message. Status code: {response.status_code}")
-            print(response.text)
+            await self.bot.send_message(chat_id=CONFIG["TG_CHAT_ID"], text=message)
+        return ""
+
+    async def line_notify_send(
+        self, message: str, image: bytes = None, image_name: str = ""
+    ) -> str:
+        if not self.client:
+            self.client = httpx.AsyncClient(timeout=self.TIMEOUT)
+        headers = {"Authorization": f"Bearer {CONFIG['LINE_NOTIFY_TOKEN']}"}
+        data = {"message": message}
+        files = {"imageFile": (image_name, image)} if image else None
+        response = await self.client.post(
+            self.LINE_NOTIFY_URL, headers=headers, data=data, files=files
+        )
+        response.raise_for_status()
+        return response.text
 
 
 class ProgramStatusEnum(Enum):
@@ -113,6 +214,54 @@ class SessionInfo(BaseModel):
     id: int
 
 
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+class LogEntry(BaseModel):
+    seq: int
+    level: str
+    time: float
+    message: str
+
+
+class ImportTime(BaseModel):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+class ObservableEvent(threading.Event):
+    """threading.Event that calls its listeners whenever its state flips."""
+
+    def __init__(self):
+        super().__init__()
+        self.listeners = []
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def set(self):
+        # Check and flip under the event's own lock so concurrent changes
+        # cannot both skip the notification, then notify outside of it
+        with self._cond:
+            changed = not self._flag
+            self._flag = True
+            self._cond.notify_all()
+        if changed:
+            self.__notify()
+
+    def clear(self):
+        with self._cond:
+            changed = self._flag
+            self._flag = False
+        if changed:
+            self.__notify()
+
+    def __notify(self):
+        for callback in self.listeners:
+            callback()
+
+
 class DummyEvent(threading.Event):
     def __init__(self):
         pass
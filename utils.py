@@ -6,10 +6,8 @@ import threading
 import time
 from datetime import datetime
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-import undetected_chromedriver as uc
+# selenium and undetected_chromedriver are imported where they are used, so
+# importing utils from the server does not pay for them at startup
 
 
 def countdown(target_time: datetime, logger: logging.Logger | None = None) -> None:
@@ -50,6 +48,10 @@ def selenium_get_img(driver, image_selector: str) -> bytes:
     Returns:
         bytes: The image in bytes.
     """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     image_element = WebDriverWait(driver, 10).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, image_selector))
     )
@@ -125,6 +127,8 @@ def raise_SystemExit_in_thread(thread: threading.Thread) -> None:
 
 
 def get_webdriver(user_data_dir: str = None, profile_dir: str = None):
+    import undetected_chromedriver as uc
+
     options = uc.ChromeOptions()
     if profile_dir:
         options.add_argument(f"--profile-directory={profile_dir}")